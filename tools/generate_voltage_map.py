@@ -20,10 +20,10 @@ Date: 2026-01-29
 import json
 import csv
 import argparse
-import os
-from pathlib import Path
 import math
 
+import numpy as np
+
 
 def load_phases(json_path):
     """Load phase parameters from Genesis Bridge optimization results."""
@@ -46,12 +46,12 @@ def phase_to_voltage(phase_rad, v_pi=5.2, v_bias=0.0):
     Formula: V = (Phase / 2π) * V_pi + V_bias
 
     Args:
-        phase_rad: Phase parameter in radians [0, 2π]
+        phase_rad: Phase parameter in radians [0, 2π] (scalar or array)
         v_pi: Half-wave voltage in Volts
         v_bias: DC bias offset in Volts
 
     Returns:
-        Voltage in Volts
+        Voltage in Volts (same shape as phase_rad)
     """
     voltage = (phase_rad / (2 * math.pi)) * v_pi + v_bias
     return voltage
@@ -62,22 +62,22 @@ def voltage_to_dac(voltage, v_max=8.0, dac_bits=16):
     Convert voltage to DAC digital value.
 
     Args:
-        voltage: Voltage in Volts [0, V_max]
+        voltage: Voltage in Volts [0, V_max] (scalar or array)
         v_max: Maximum voltage (corresponds to DAC max value)
         dac_bits: DAC resolution in bits
 
     Returns:
-        DAC integer value [0, 2^bits - 1]
+        DAC integer value [0, 2^bits - 1] (int for scalar input, int64 array otherwise)
     """
     dac_max = (2 ** dac_bits) - 1
 
-    # Clamp voltage to [0, V_max]
-    voltage_clamped = max(0.0, min(voltage, v_max))
+    # Clamp voltage to [0, V_max] (fmax/fmin map NaN to 0, as max(0.0, min(v, v_max)) does)
+    voltage_clamped = np.fmin(np.fmax(voltage, 0.0), v_max)
 
-    # Linear mapping: V → DAC
-    dac_value = int((voltage_clamped / v_max) * dac_max)
+    # Linear mapping: V → DAC (truncation, as int())
+    dac_value = ((voltage_clamped / v_max) * dac_max).astype(np.int64)
 
-    return dac_value
+    return dac_value if np.ndim(dac_value) else int(dac_value)
 
 
 def generate_voltage_map(phase_list, v_pi=5.2, v_bias=0.0, v_max=8.0):
@@ -93,26 +93,23 @@ def generate_voltage_map(phase_list, v_pi=5.2, v_bias=0.0, v_max=8.0):
     Returns:
         List of dictionaries with Channel_ID, Phase_Rad, Voltage_V, DAC_Value_16bit
     """
-    voltage_map = []
-
-    for channel_id, phase in enumerate(phase_list):
-        # Convert phase to voltage
-        voltage = phase_to_voltage(phase, v_pi, v_bias)
+    phases = np.asarray(phase_list, dtype=np.float64)
 
-        # Safety clamp
-        voltage_clamped = max(0.0, min(voltage, v_max))
+    # Convert all channels in one pass: phase → voltage → safety clamp → DAC
+    voltages = np.fmin(np.fmax(phase_to_voltage(phases, v_pi, v_bias), 0.0), v_max)
+    dac_values = voltage_to_dac(voltages, v_max)
 
-        # Convert to DAC value
-        dac_value = voltage_to_dac(voltage_clamped, v_max)
-
-        voltage_map.append({
+    return [
+        {
             'Channel_ID': channel_id,
             'Phase_Rad': phase,
-            'Voltage_V': voltage_clamped,
+            'Voltage_V': voltage,
             'DAC_Value_16bit': dac_value
-        })
-
-    return voltage_map
+        }
+        for channel_id, (phase, voltage, dac_value) in enumerate(
+            zip(phases.tolist(), voltages.tolist(), dac_values.tolist())
+        )
+    ]
 
 
 def save_voltage_csv(voltage_map, output_path):
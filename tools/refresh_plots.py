@@ -5,10 +5,17 @@ Genesis-OS 标准化绘图工具
 """
 
 import json
+from concurrent.futures import ProcessPoolExecutor
+import matplotlib
+matplotlib.use('Agg')  # 批量导出 PNG，不需要交互式后端
 import matplotlib.pyplot as plt
-import numpy as np
 from pathlib import Path
 
+try:
+    import orjson  # 可选依赖：更快的 JSON 解析
+except ImportError:
+    orjson = None
+
 # ============================================================
 # 统一配置标准 (Style Guide)
 # ============================================================
@@ -28,6 +35,7 @@ COLOR_TRACE = '#1E90FF'      # 深蓝色 (Blue)
 # 图表尺寸
 FIGURE_SIZE = (10, 6)
 DPI = 300
+PNG_COMPRESS_LEVEL = 3  # zlib 压缩级别（默认 6）：编码更快，文件略大
 
 # 字体配置
 plt.rcParams.update({
@@ -41,6 +49,16 @@ plt.rcParams.update({
 })
 
 
+def _load_json(json_path):
+    """读取 JSON 文件（有 orjson 时用 orjson 解析，否则回退到标准库 json）"""
+    if orjson is not None:
+        with open(json_path, 'rb') as f:
+            return orjson.loads(f.read())
+
+    with open(json_path, 'r') as f:
+        return json.load(f)
+
+
 def load_evolution_data(json_path):
     """
     加载 JSON 文件并提取优化历史数据
@@ -52,8 +70,7 @@ def load_evolution_data(json_path):
         n_photons: 光子数
         evolution_data: 优化历史列表
     """
-    with open(json_path, 'r') as f:
-        data = json.load(f)
+    data = _load_json(json_path)
 
     n_photons = data['system_config']['n_modes']
     evolution_data = data['evolution']
@@ -134,20 +151,54 @@ def plot_convergence(n_photons_display, evolution_data, output_path):
                    labelsize=10)
 
     # 紧凑布局
-    plt.tight_layout()
+    fig.tight_layout()
 
-    # 保存图片
-    plt.savefig(output_path,
+    # 保存图片（布局已由 tight_layout 确定，不再用 bbox_inches='tight' 二次渲染）
+    fig.savefig(output_path,
                 dpi=DPI,
-                bbox_inches='tight',
                 facecolor='white',
-                edgecolor='none')
+                edgecolor='none',
+                pil_kwargs={'compress_level': PNG_COMPRESS_LEVEL})
 
-    plt.close()
+    plt.close(fig)
 
     return output_path
 
 
+def render_one(n_photons, results_dir=Path("results")):
+    """
+    生成单个光子数配置的收敛图（在独立进程中运行）
+
+    Args:
+        n_photons: 光子数（56/128/256）
+        results_dir: 输入 JSON 与输出 PNG 所在目录
+
+    Returns:
+        状态信息（由主进程按顺序打印）
+    """
+    json_file = results_dir / f"genesis_{n_photons}_blind_lock.json"
+    png_file = results_dir / FILE_MAPPING[n_photons]
+
+    # 检查 JSON 文件是否存在
+    if not json_file.exists():
+        return f"  ⚠️  警告：{json_file.name} 不存在，跳过"
+
+    try:
+        # 加载数据（忽略 JSON 内部的光子数，使用文件名中的光子数）
+        _, evolution_data = load_evolution_data(json_file)
+
+        # 使用文件名中的光子数作为标题
+        output_path = plot_convergence(n_photons, evolution_data, png_file)
+
+        # 获取文件大小
+        file_size = output_path.stat().st_size / 1024  # KB
+
+        return f"  ✅ 成功生成：{png_file.name} ({file_size:.1f} KB)"
+
+    except Exception as e:
+        return f"  ❌ 错误：{e}"
+
+
 def main():
     """主函数：批量生成所有图表"""
 
@@ -161,33 +212,16 @@ def main():
         print(f"❌ 错误：results/ 目录不存在")
         return
 
-    # 处理三个光子数配置
-    for n_photons in [56, 128, 256]:
-        json_file = results_dir / f"genesis_{n_photons}_blind_lock.json"
-        png_file = results_dir / FILE_MAPPING[n_photons]
-
-        print(f"\n📊 处理 {n_photons} 光子系统...")
-
-        # 检查 JSON 文件是否存在
-        if not json_file.exists():
-            print(f"  ⚠️  警告：{json_file.name} 不存在，跳过")
-            continue
-
-        try:
-            # 加载数据（忽略 JSON 内部的光子数，使用文件名中的光子数）
-            _, evolution_data = load_evolution_data(json_file)
-
-            # 使用文件名中的光子数作为标题
-            output_path = plot_convergence(n_photons, evolution_data, png_file)
-
-            # 获取文件大小
-            file_size = output_path.stat().st_size / 1024  # KB
-
-            print(f"  ✅ 成功生成：{png_file.name} ({file_size:.1f} KB)")
+    # 三个光子数配置相互独立：每个进程各自持有 matplotlib 实例并行绘制
+    photon_counts = [56, 128, 256]
+    with ProcessPoolExecutor(max_workers=len(photon_counts)) as executor:
+        statuses = executor.map(render_one, photon_counts,
+                                [results_dir] * len(photon_counts))
 
-        except Exception as e:
-            print(f"  ❌ 错误：{e}")
-            continue
+        # 按配置顺序输出结果
+        for n_photons, status in zip(photon_counts, statuses):
+            print(f"\n📊 处理 {n_photons} 光子系统...")
+            print(status)
 
     print("\n" + "=" * 70)
     print("📊 所有图表生成完成！")
@@ -4,11 +4,21 @@ Genesis-OS Legacy Plot Regeneration Tool
 重新生成 legacy 图片，使用纯英文标签
 """
 
+import functools
 import json
+import matplotlib
+matplotlib.use('Agg')  # 批量导出 PNG，不需要交互式后端
 import matplotlib.pyplot as plt
+from matplotlib.collections import LineCollection
+from matplotlib.lines import Line2D
 import numpy as np
 from pathlib import Path
 
+try:
+    import orjson  # 可选依赖：更快的 JSON 解析
+except ImportError:
+    orjson = None
+
 # ============================================================
 # 配置标准
 # ============================================================
@@ -21,6 +31,7 @@ OUTPUT_LOCKING = "results/locking_trace.png"
 FIGURE_SIZE_LARGE = (12, 8)
 FIGURE_SIZE_SMALL = (10, 6)
 DPI = 300
+PNG_COMPRESS_LEVEL = 3  # zlib 压缩级别（默认 6）：编码更快，文件略大
 
 # 配色方案（与标准化图表一致）
 COLOR_INIT = '#00CED1'      # 青色 (Cyan)
@@ -40,6 +51,16 @@ plt.rcParams.update({
 })
 
 
+def _load_json(json_path):
+    """读取 JSON 文件（有 orjson 时用 orjson 解析，否则回退到标准库 json）"""
+    if orjson is not None:
+        with open(json_path, 'rb') as f:
+            return orjson.loads(f.read())
+
+    with open(json_path, 'r') as f:
+        return json.load(f)
+
+
 def load_phase_data():
     """加载 6-mode 相位数据"""
     json_path = Path("results/phase_params_opt.json")
@@ -48,8 +69,12 @@ def load_phase_data():
         print(f"❌ Error: {json_path} not found")
         return None
 
-    with open(json_path, 'r') as f:
-        data = json.load(f)
+    data = _load_json(json_path)
+
+    # 相位字典（phase_1 … phase_n）只在加载时转换一次为数组，绘图按下标访问
+    phases = data['optimal_phases']
+    num_modes = data['system_config']['num_modes']
+    data['_phase_array'] = np.array([phases[f'phase_{i}'] for i in range(1, num_modes + 1)])
 
     return data
 
@@ -63,12 +88,11 @@ def plot_simple_tutorial(data, output_path):
         output_path: 输出 PNG 路径
     """
     num_modes = data['system_config']['num_modes']
-    phases = data['optimal_phases']
     metrics = data['performance_metrics']
 
-    # 提取相位值
+    # 相位值（load_phase_data 已转换为数组）
     mode_indices = list(range(1, num_modes + 1))
-    phase_values = [phases[f'phase_{i}'] for i in mode_indices]
+    phase_values = data['_phase_array']
 
     # 创建图表
     fig, (ax1, ax2) = plt.subplots(1, 2, figsize=FIGURE_SIZE_LARGE)
@@ -131,15 +155,23 @@ def plot_simple_tutorial(data, output_path):
     # 保存图片
     plt.savefig(output_path,
                 dpi=DPI,
-                bbox_inches='tight',
                 facecolor='white',
-                edgecolor='none')
+                edgecolor='none',
+                pil_kwargs={'compress_level': PNG_COMPRESS_LEVEL})
 
     plt.close()
 
     return output_path
 
 
+@functools.lru_cache(maxsize=16)
+def _mode_colors(num_modes):
+    """按模式数缓存 viridis 配色（数组设为只读，原地修改会直接报错）"""
+    colors = plt.cm.viridis(np.linspace(0, 1, num_modes))
+    colors.flags.writeable = False
+    return colors
+
+
 def plot_locking_trace(data, output_path):
     """
     绘制相位锁定轨迹图
@@ -149,11 +181,9 @@ def plot_locking_trace(data, output_path):
         output_path: 输出 PNG 路径
     """
     num_modes = data['system_config']['num_modes']
-    phases = data['optimal_phases']
 
-    # 提取相位值
-    mode_indices = np.arange(num_modes)
-    phase_values = np.array([phases[f'phase_{i+1}'] for i in range(num_modes)])
+    # 相位值（load_phase_data 已转换为数组）
+    phase_values = data['_phase_array']
 
     # 生成模拟锁定轨迹（从随机相位到最优相位）
     num_steps = 20
@@ -162,15 +192,12 @@ def plot_locking_trace(data, output_path):
     # 初始随机相位
     initial_phases = np.random.uniform(0, 2*np.pi, num_modes)
 
-    # 模拟优化轨迹
-    trajectory = np.zeros((num_steps, num_modes))
-    for step in range(num_steps):
-        alpha = step / (num_steps - 1)  # 0 to 1
-        # 插值：初始 → 最优
-        trajectory[step] = (1 - alpha) * initial_phases + alpha * phase_values
-        # 添加噪声（模拟真实优化）
-        if step < num_steps - 1:
-            trajectory[step] += np.random.normal(0, 0.1, num_modes)
+    # 模拟优化轨迹：插值 初始 → 最优（每行一步，alpha 从 0 到 1）
+    alpha = (np.arange(num_steps) / (num_steps - 1))[:, None]
+    trajectory = (1 - alpha) * initial_phases + alpha * phase_values
+
+    # 添加噪声（模拟真实优化）；一次抽取前 num_steps-1 步，与逐步抽取的随机数顺序一致
+    trajectory[:-1] += np.random.normal(0, 0.1, (num_steps - 1, num_modes))
 
     # 确保最后一个点是最优相位
     trajectory[-1] = phase_values
@@ -178,17 +205,25 @@ def plot_locking_trace(data, output_path):
     # 创建图表
     fig, ax = plt.subplots(figsize=FIGURE_SIZE_LARGE)
 
-    # 绘制轨迹
-    colors = plt.cm.viridis(np.linspace(0, 1, num_modes))
-
-    for mode_idx in range(num_modes):
-        ax.plot(range(num_steps), trajectory[:, mode_idx],
-                color=colors[mode_idx],
-                marker='o',
-                markersize=3,
-                linewidth=1.5,
-                alpha=0.8,
-                label=f'Mode {mode_idx + 1}')
+    # 绘制轨迹（横轴数组只构建一次，各模式共用）
+    colors = _mode_colors(num_modes)
+    steps = np.arange(num_steps)
+
+    # 所有模式的折线合并为一个 LineCollection，数据点合并为一个 scatter
+    mode_traces = trajectory.T  # (num_modes, num_steps)
+    segments = np.stack([np.broadcast_to(steps, mode_traces.shape), mode_traces], axis=-1)
+    ax.add_collection(LineCollection(segments, colors=colors, linewidths=1.5, alpha=0.8))
+    ax.scatter(np.tile(steps, num_modes), mode_traces.ravel(),
+               c=np.repeat(colors, num_steps, axis=0),
+               marker='o', s=3**2, alpha=0.8, zorder=2.5)
+    ax.autoscale_view()
+
+    # 图例代理句柄（集合对象本身不带逐模式标签）
+    mode_handles = [
+        Line2D([], [], color=colors[mode_idx], marker='o', markersize=3,
+               linewidth=1.5, alpha=0.8, label=f'Mode {mode_idx + 1}')
+        for mode_idx in range(num_modes)
+    ]
 
     # 标记初始点和最终点
     ax.axvline(x=0, color=COLOR_INIT, linestyle='--', linewidth=2, alpha=0.7,
@@ -204,7 +239,8 @@ def plot_locking_trace(data, output_path):
     ax.set_ylabel('Phase (radians)', fontweight='bold')
 
     # 设置图例（分两列以节省空间）
-    ax.legend(loc='upper right',
+    ax.legend(handles=mode_handles + ax.get_legend_handles_labels()[0],
+             loc='upper right',
              fontsize=8,
              ncol=2,
              framealpha=0.9,
@@ -230,9 +266,9 @@ def plot_locking_trace(data, output_path):
     # 保存图片
     plt.savefig(output_path,
                 dpi=DPI,
-                bbox_inches='tight',
                 facecolor='white',
-                edgecolor='none')
+                edgecolor='none',
+                pil_kwargs={'compress_level': PNG_COMPRESS_LEVEL})
 
     plt.close()
 
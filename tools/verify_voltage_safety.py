@@ -19,12 +19,75 @@ Purpose: Quality Assurance before hardware deployment
 """
 
 import csv
+import io
 import sys
 import argparse
 from pathlib import Path
 from typing import List, Dict, Tuple
 
 
+def _row_dict(fieldnames, raw):
+    """Map a raw CSV row to a dict the way csv.DictReader does (restkey/restval None)."""
+    fieldnames = fieldnames or []
+    row = dict(zip(fieldnames, raw))
+    if len(raw) > len(fieldnames):
+        row[None] = raw[len(fieldnames):]
+    else:
+        for key in fieldnames[len(raw):]:
+            row[key] = None
+    return row
+
+
+def _parse_columns(fieldnames, raw_rows):
+    """
+    Convert all rows to typed column arrays in one pass per column.
+
+    Returns:
+        (channel_ids, phases, voltages, dac_values) arrays, or None if the
+        header repeats a column name or any row is malformed (missing
+        columns, wrong field count, bad number)
+    """
+    import numpy as np
+
+    names = ['Channel_ID', 'Phase_Rad', 'Voltage_V', 'DAC_Value_16bit']
+    if fieldnames is None or not set(names) <= set(fieldnames):
+        return None
+    if len(set(fieldnames)) != len(fieldnames):
+        return None  # duplicate headers: DictReader keeps the last column, leave it to the per-row path
+    if any(len(raw) != len(fieldnames) for raw in raw_rows):
+        return None
+
+    columns = list(zip(*raw_rows)) if raw_rows else [()] * len(fieldnames)
+    channel_col, phase_col, voltage_col, dac_col = (
+        columns[fieldnames.index(name)] for name in names
+    )
+
+    try:
+        return (
+            np.array(channel_col, dtype=str).astype(np.int64),
+            np.array(phase_col, dtype=str).astype(np.float64),
+            np.array(voltage_col, dtype=str).astype(np.float64),
+            np.array(dac_col, dtype=str).astype(np.int64),
+        )
+    except (ValueError, OverflowError):
+        return None
+
+
+def _int_array(values):
+    """
+    Build an integer array from parsed Python ints.
+
+    Values outside the int64 range (e.g. a corrupted DAC code) are kept
+    exact in an object array, so the range checks still flag them.
+    """
+    import numpy as np
+
+    try:
+        return np.array(values, dtype=np.int64)
+    except OverflowError:
+        return np.array(values, dtype=object)
+
+
 def verify_csv(
     filepath: str,
     v_max: float = 8.0,
@@ -46,10 +109,31 @@ def verify_csv(
         - warnings: List of warning messages
         - violations: List of violating rows
     """
-    print(f"🔍 Genesis-OS Safety Verification")
-    print(f"📁 File: {filepath}")
-    print(f"⚙️  Parameters: V_max={v_max}V, DAC_max={dac_max}, Channels={expected_channels}")
-    print("="*70)
+    # Collect the report in memory and write it to stdout in one go
+    out = io.StringIO()
+    try:
+        return _verify_csv(filepath, v_max, dac_max, expected_channels, out)
+    finally:
+        sys.stdout.write(out.getvalue())
+        sys.stdout.flush()
+
+
+def _verify_csv(
+    filepath: str,
+    v_max: float,
+    dac_max: int,
+    expected_channels: int,
+    out: io.StringIO
+) -> Tuple[bool, List[str], List[Dict]]:
+    """Run the checks of verify_csv, writing the report to ``out``."""
+    # numpy is imported here rather than at module level so that --help and
+    # other early exits of this CLI gate do not pay its import time
+    import numpy as np
+
+    print(f"🔍 Genesis-OS Safety Verification", file=out)
+    print(f"📁 File: {filepath}", file=out)
+    print(f"⚙️  Parameters: V_max={v_max}V, DAC_max={dac_max}, Channels={expected_channels}", file=out)
+    print("="*70, file=out)
 
     violations = []
     warnings = []
@@ -59,26 +143,42 @@ def verify_csv(
 
     # Check if file exists
     if not Path(filepath).exists():
-        print(f"❌ ERROR: File not found: {filepath}")
+        print(f"❌ ERROR: File not found: {filepath}", file=out)
         return False, [f"File not found: {filepath}"], []
 
     try:
-        with open(filepath, 'r') as f:
-            reader = csv.DictReader(f)
+        with open(filepath, 'r', newline='') as f:
+            reader = csv.reader(f)
+            actual_headers = next(reader, None)
+            raw_rows = [raw for raw in reader if raw]  # skip blank lines, as DictReader does
 
-            # Validate CSV headers
-            expected_headers = ['Channel_ID', 'Phase_Rad', 'Voltage_V', 'DAC_Value_16bit']
-            actual_headers = reader.fieldnames
+        # Validate CSV headers
+        expected_headers = ['Channel_ID', 'Phase_Rad', 'Voltage_V', 'DAC_Value_16bit']
 
-            if actual_headers != expected_headers:
-                warnings.append(
-                    f"Header mismatch. Expected: {expected_headers}, "
-                    f"Got: {actual_headers}"
-                )
+        if actual_headers != expected_headers:
+            warnings.append(
+                f"Header mismatch. Expected: {expected_headers}, "
+                f"Got: {actual_headers}"
+            )
 
-            # Verify each row
-            for row in reader:
-                channel_count += 1
+        channel_count = len(raw_rows)
+        parse_errors = []
+
+        # Fast path: convert whole columns at once; fall back to per-row
+        # parsing only if some row is malformed, to report it precisely
+        columns = _parse_columns(actual_headers, raw_rows)
+
+        if columns is not None:
+            channel_id_arr, phase_arr, voltage_arr, dac_arr = columns
+            row_index_arr = np.arange(channel_count, dtype=np.int64)
+        else:
+            row_indices = []
+            channel_ids = []
+            phases = []
+
+            for row_index, raw in enumerate(raw_rows):
+                row = _row_dict(actual_headers, raw)
+                channel_id = row.get('Channel_ID')  # raw value, reported if parsing fails
 
                 try:
                     # Extract values
@@ -86,55 +186,84 @@ def verify_csv(
                     phase = float(row['Phase_Rad'])
                     voltage = float(row['Voltage_V'])
                     dac_value = int(row['DAC_Value_16bit'])
-
-                    # Store for statistics
-                    voltages.append(voltage)
-                    dac_values.append(dac_value)
-
-                    # Check 1: Voltage safety (CRITICAL)
-                    if voltage > v_max:
-                        violations.append({
-                            'type': 'CRITICAL',
-                            'channel': channel_id,
-                            'reason': f'Voltage {voltage:.4f}V exceeds V_max={v_max}V',
-                            'row': row
-                        })
-
-                    # Check 2: Voltage negative (WARNING)
-                    if voltage < 0:
-                        warnings.append(
-                            f"Channel {channel_id}: Negative voltage {voltage:.4f}V"
-                        )
-
-                    # Check 3: DAC value range (CRITICAL)
-                    if dac_value < 0 or dac_value > dac_max:
-                        violations.append({
-                            'type': 'CRITICAL',
-                            'channel': channel_id,
-                            'reason': f'DAC value {dac_value} out of range [0, {dac_max}]',
-                            'row': row
-                        })
-
-                    # Check 4: Phase range (WARNING)
-                    if phase < 0 or phase > 6.28318530718:
-                        warnings.append(
-                            f"Channel {channel_id}: Phase {phase:.6f} rad outside [0, 2π]"
-                        )
-
-                    # Check 5: Channel ID sequence (WARNING)
-                    if channel_id != channel_count - 1:
-                        warnings.append(
-                            f"Channel ID sequence error: expected {channel_count - 1}, "
-                            f"got {channel_id}"
-                        )
-
                 except (ValueError, KeyError) as e:
-                    violations.append({
+                    parse_errors.append((row_index, {
                         'type': 'CRITICAL',
                         'channel': channel_id,
                         'reason': f'Parse error: {str(e)}',
                         'row': row
-                    })
+                    }))
+                    continue
+
+                row_indices.append(row_index)
+                channel_ids.append(channel_id)
+                phases.append(phase)
+
+                # Store for statistics
+                voltages.append(voltage)
+                dac_values.append(dac_value)
+
+            channel_id_arr = _int_array(channel_ids)
+            phase_arr = np.array(phases, dtype=np.float64)
+            voltage_arr = np.array(voltages, dtype=np.float64)
+            dac_arr = _int_array(dac_values)
+            row_index_arr = np.array(row_indices, dtype=np.int64)
+
+        # Check 1: Voltage safety (CRITICAL)
+        over_voltage = voltage_arr > v_max
+        # Check 2: Voltage negative (WARNING)
+        negative_voltage = voltage_arr < 0
+        # Check 3: DAC value range (CRITICAL)
+        dac_out_of_range = (dac_arr < 0) | (dac_arr > dac_max)
+        # Check 4: Phase range (WARNING)
+        phase_out_of_range = (phase_arr < 0) | (phase_arr > 6.28318530718)
+        # Check 5: Channel ID sequence (WARNING)
+        sequence_error = channel_id_arr != row_index_arr
+
+        flagged = (over_voltage | negative_voltage | dac_out_of_range
+                   | phase_out_of_range | sequence_error)
+
+        # Build messages only for flagged rows, in file order
+        row_violations = []
+        for k in np.flatnonzero(flagged).tolist():
+            row_index = int(row_index_arr[k])
+            channel_id = int(channel_id_arr[k])
+            voltage = float(voltage_arr[k])
+
+            if over_voltage[k]:
+                row_violations.append((row_index, {
+                    'type': 'CRITICAL',
+                    'channel': channel_id,
+                    'reason': f'Voltage {voltage:.4f}V exceeds V_max={v_max}V',
+                    'row': _row_dict(actual_headers, raw_rows[row_index])
+                }))
+
+            if negative_voltage[k]:
+                warnings.append(
+                    f"Channel {channel_id}: Negative voltage {voltage:.4f}V"
+                )
+
+            if dac_out_of_range[k]:
+                row_violations.append((row_index, {
+                    'type': 'CRITICAL',
+                    'channel': channel_id,
+                    'reason': f'DAC value {int(dac_arr[k])} out of range [0, {dac_max}]',
+                    'row': _row_dict(actual_headers, raw_rows[row_index])
+                }))
+
+            if phase_out_of_range[k]:
+                warnings.append(
+                    f"Channel {channel_id}: Phase {float(phase_arr[k]):.6f} rad outside [0, 2π]"
+                )
+
+            if sequence_error[k]:
+                warnings.append(
+                    f"Channel ID sequence error: expected {row_index}, "
+                    f"got {channel_id}"
+                )
+
+        # Merge parse errors and check violations back into file order
+        violations = [v for _, v in sorted(parse_errors + row_violations, key=lambda item: item[0])]
 
         # Check 6: Channel count verification
         if channel_count != expected_channels:
@@ -144,62 +273,62 @@ def verify_csv(
             )
 
         # Generate summary statistics
-        if voltages:
-            v_min = min(voltages)
-            v_max_actual = max(voltages)
-            v_mean = sum(voltages) / len(voltages)
+        if voltage_arr.size:
+            v_min = float(voltage_arr.min())
+            v_max_actual = float(voltage_arr.max())
+            v_mean = float(voltage_arr.mean())
 
-            print(f"\n📊 STATISTICS")
-            print(f"   Channels: {channel_count}")
-            print(f"   Voltage range: {v_min:.4f}V → {v_max_actual:.4f}V")
-            print(f"   Mean voltage: {v_mean:.4f}V")
-            print(f"   DAC range: {min(dac_values)} → {max(dac_values)}")
+            print(f"\n📊 STATISTICS", file=out)
+            print(f"   Channels: {channel_count}", file=out)
+            print(f"   Voltage range: {v_min:.4f}V → {v_max_actual:.4f}V", file=out)
+            print(f"   Mean voltage: {v_mean:.4f}V", file=out)
+            print(f"   DAC range: {int(dac_arr.min())} → {int(dac_arr.max())}", file=out)
 
             if v_max_actual < v_max:
                 safety_margin = v_max - v_max_actual
-                print(f"   ✅ Safety margin: {safety_margin:.2f}V")
+                print(f"   ✅ Safety margin: {safety_margin:.2f}V", file=out)
 
         # Print warnings
         if warnings:
-            print(f"\n⚠️  WARNINGS ({len(warnings)})")
+            print(f"\n⚠️  WARNINGS ({len(warnings)})", file=out)
             for i, warning in enumerate(warnings[:10], 1):  # Show first 10
-                print(f"   {i}. {warning}")
+                print(f"   {i}. {warning}", file=out)
             if len(warnings) > 10:
-                print(f"   ... and {len(warnings) - 10} more warnings")
+                print(f"   ... and {len(warnings) - 10} more warnings", file=out)
 
         # Print violations
         if violations:
-            print(f"\n❌ VIOLATIONS ({len(violations)})")
+            print(f"\n❌ VIOLATIONS ({len(violations)})", file=out)
             for i, v in enumerate(violations[:10], 1):  # Show first 10
-                print(f"   {i}. [{v['type']}] Channel {v['channel']}: {v['reason']}")
+                print(f"   {i}. [{v['type']}] Channel {v['channel']}: {v['reason']}", file=out)
             if len(violations) > 10:
-                print(f"   ... and {len(violations) - 10} more violations")
+                print(f"   ... and {len(violations) - 10} more violations", file=out)
 
         # Final verdict
-        print("\n" + "="*70)
+        print("\n" + "="*70, file=out)
 
         if violations:
-            print("❌ VERIFICATION FAILED - CRITICAL ISSUES FOUND")
-            print("\n🚨 DO NOT LOAD THIS FILE INTO HARDWARE")
-            print("   Please review violations and correct the source data.")
+            print("❌ VERIFICATION FAILED - CRITICAL ISSUES FOUND", file=out)
+            print("\n🚨 DO NOT LOAD THIS FILE INTO HARDWARE", file=out)
+            print("   Please review violations and correct the source data.", file=out)
             return False, warnings, violations
         else:
-            print("✅ VERIFICATION PASSED - FILE IS SAFE FOR HARDWARE")
-            print(f"\n✨ All {channel_count} channels verified")
-            print(f"✨ All voltages <= {v_max}V")
-            print(f"✨ All DAC values in range [0, {dac_max}]")
+            print("✅ VERIFICATION PASSED - FILE IS SAFE FOR HARDWARE", file=out)
+            print(f"\n✨ All {channel_count} channels verified", file=out)
+            print(f"✨ All voltages <= {v_max}V", file=out)
+            print(f"✨ All DAC values in range [0, {dac_max}]", file=out)
             if not warnings:
-                print("✨ No warnings - perfect quality")
+                print("✨ No warnings - perfect quality", file=out)
             else:
-                print(f"⚠️  {len(warnings)} warnings (non-critical)")
-            print("\n✅ This file is approved for hardware deployment.")
+                print(f"⚠️  {len(warnings)} warnings (non-critical)", file=out)
+            print("\n✅ This file is approved for hardware deployment.", file=out)
             return True, warnings, []
 
     except FileNotFoundError:
-        print(f"❌ ERROR: File not found: {filepath}")
+        print(f"❌ ERROR: File not found: {filepath}", file=out)
         return False, [f"File not found: {filepath}"], []
     except Exception as e:
-        print(f"❌ ERROR: Unexpected error: {str(e)}")
+        print(f"❌ ERROR: Unexpected error: {str(e)}", file=out)
         return False, [f"Unexpected error: {str(e)}"], []
 
 